@@ -9,28 +9,116 @@
 # ---------------------------------------------------------------------------
 import yaml
 import re
+import sys
 import logging
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import attrgetter
+from typing import Optional
+
+# Use the libyaml based loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+# Translation table deleting every ASCII character that is not part of a
+# plain decimal number, with a regular expression to catch anything non-ASCII
+_NON_NUMERIC = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if chr(c) not in '0123456789.'))
+_FLOAT_RE = re.compile(r"[^0-9.]+")
+
+# Timestamp formats used in the yaml files and the scraped html respectively
+_SHOT_DATE_FMT = '%Y-%m-%dT%H:%M:%SZ'
+_SCRAPED_DATE_FMT = "%Y-%m-%d %H:%M:%S"
+# Date/time separator and trailing suffix for each fixed width format
+_FIXED_LAYOUTS = {
+    _SHOT_DATE_FMT: ('T', 'Z'),
+    _SCRAPED_DATE_FMT: (' ', ''),
+}
+
+
+def _parse_fixed_iso(string:str, date_fmt:str) -> datetime:
+    '''
+    Parses the fixed width timestamp formats used by the yaml files and the
+    scraped html with datetime.fromisoformat, which is much faster than
+    datetime.strptime. The trailing 'Z' is dropped before parsing so the
+    result stays naive on every supported Python version. Anything that does
+    not match the expected layout falls back to strptime so malformed values
+    raise the same errors as before
+    '''
+    sep, suffix = _FIXED_LAYOUTS[date_fmt]
+    if (len(string) == 19 + len(suffix) and string[10] == sep
+            and string[19:] == suffix
+            and string[4] == string[7] == '-'
+            and string[13] == string[16] == ':'):
+        try:
+            return datetime.fromisoformat(string[:19])
+        except ValueError:
+            pass
+
+    return datetime.strptime(string, date_fmt)
+
+
+# Scraped values and timestamps often repeat between polls, so conversions
+# are cached on the raw string
+@lru_cache(maxsize=4096)
+def _to_float(string:str) -> float:
+    # Remove non-numeric characters, only using the regular expression when
+    # non-ASCII characters are left over
+    numeric_string = string.translate(_NON_NUMERIC)
+    if not numeric_string.isascii():
+        numeric_string = _FLOAT_RE.sub("", numeric_string)
+    return float(numeric_string)
+
+
+@lru_cache(maxsize=256)
+def _to_date(value:str) -> datetime:
+    # Assuming value is a string representation of a datetime
+    return _parse_fixed_iso(value, _SCRAPED_DATE_FMT)
+
+
+# Shots in a run frequently share start and stop times
+@lru_cache(maxsize=256)
+def _to_shot_date(value:str) -> datetime:
+    return _parse_fixed_iso(value, _SHOT_DATE_FMT)
+
+
+def _intern(key):
+    '''
+    Interns ids read from the yaml files so repeated ids share a single
+    string object. Non-string keys (e.g. numeric yaml keys) are left as is
+    '''
+    if isinstance(key, str):
+        return sys.intern(key)
+    return key
+
 
 class Shot:
 
+    __slots__ = ('tags', 'start_time', 'stop_time')
+
     def __init__(self, tags:dict, start_time:str, stop_time:str):
-        
-        date_fmt = '%Y-%m-%dT%H:%M:%SZ'
+
         self.tags = tags
-        self.start_time = datetime.strptime(start_time, date_fmt)
-        self.stop_time = datetime.strptime(stop_time, date_fmt)
+        self.start_time = _to_shot_date(start_time)
+        self.stop_time = _to_shot_date(stop_time)
 
-    def __lt__(self, other):
+    def __lt__(self, other:object) -> bool:
+        if not isinstance(other, Shot):
+            return NotImplemented
         return self.start_time < other.start_time
     
-    def __eq__(self, other):
+    def __eq__(self, other:object) -> bool:
+        if not isinstance(other, Shot):
+            return NotImplemented
         return self.start_time == other.start_time
     
-    def __gt__(self, other):
+    def __gt__(self, other:object) -> bool:
+        if not isinstance(other, Shot):
+            return NotImplemented
         return self.start_time > other.start_time
 
 
@@ -39,16 +127,13 @@ class Shots:
     def __init__(self, filepath:str):
         
         with open(filepath, 'r') as file:
-            list = yaml.safe_load(file)['shots']
-
-        self.shot_list = []
-        for shot in list:
-            tags = shot['tags']
-            start_time = shot['time']['start']
-            stop_time = shot['time']['stop']
-            s = Shot(tags, start_time, stop_time)
-            self.shot_list.append(s)
-        self.shot_list = sorted(self.shot_list)
+            list = yaml.load(file, Loader=_SafeLoader)['shots']
+
+        self.shot_list = [Shot(shot['tags'], shot['time']['start'], shot['time']['stop'])
+                          for shot in list]
+        # Sorting on the start time directly compares the datetimes without
+        # going through Shot.__lt__
+        self.shot_list.sort(key=attrgetter('start_time'))
         
         self.length = len(self.shot_list)
 
@@ -68,6 +153,7 @@ class Measurement:
         id_list : list
             list of all the ids within the object in the order: 
                 [timestamp_id, dict_template keys]
+            built on access rather than stored
         time : datetime
             datetime of last stored data
         data : dict
@@ -76,16 +162,17 @@ class Measurement:
             data in the type specified by the template
     ''' 
 
-    def __init__(self, timestamp:str, dict_template:dict):
-        self.timestamp_id = timestamp
-        self.dict_template = dict_template
-        self.id_list = [timestamp]
+    __slots__ = ('timestamp_id', 'dict_template', 'time', 'data')
 
-        for key, value in dict_template.items():
-                self.id_list.append(key)
+    def __init__(self, timestamp:str, dict_template:dict):
+        self.timestamp_id = _intern(timestamp)
+        self.dict_template = {_intern(k): v for k, v in dict_template.items()}
+        self.time: Optional[datetime] = None
+        self.data: dict = {}
 
-        self.time = None
-        self.data = {}
+    @property
+    def id_list(self) -> list:
+        return [self.timestamp_id, *self.dict_template]
 
 
 class Measurements:
@@ -108,9 +195,11 @@ class Measurements:
         
         self.measurement_list = []  # List of Measurement objects
         self.full_id_list = []  # List of ids from all Measurement objects
+        # Lookup table so store_data can match scraped ids directly
+        self._field_index: dict = {}  # data id -> [(Measurement, data type), ...]
 
         with open(filepath, "r") as file:
-            data_format = yaml.safe_load(file)
+            data_format = yaml.load(file, Loader=_SafeLoader)
 
         # yaml file has the format:
         #     {timestamp_1: {data_1}, timestamp_2: {data_2}, ..., timestamp_n:{data_n}}
@@ -119,35 +208,32 @@ class Measurements:
         for key, value in data_format.items():
             measurement = Measurement(key, value)
             self.measurement_list.append(measurement)
-            self.full_id_list += measurement.id_list
+            self.full_id_list.append(measurement.timestamp_id)
+            self.full_id_list += measurement.dict_template
+            # A data id may appear under several timestamps, so every
+            # matching Measurement is kept
+            for k, v in measurement.dict_template.items():
+                self._field_index.setdefault(k, []).append((measurement, v))
 
         # Length of self.measurement list for easier iteration through all 
         # Measurement objects
         self.length = len(self.measurement_list)  
 
 
-    def convert_to_float(self, string):
+    def convert_to_float(self, string:str) -> float:
         
-        # Use regular expression to remove non-numeric characters
-        numeric_string = re.sub(r"[^0-9.]+", "", string)
-        result_float = float(numeric_string)
-
-        return result_float
+        return _to_float(string)
 
 
-    def convert_to_date(self, value):
+    def convert_to_date(self, value:str) -> datetime:
         
-        date_fmt = "%Y-%m-%d %H:%M:%S"
-        # Assuming value is a string representation of a datetime
-        date = datetime.strptime(value, date_fmt)
+        return _to_date(value)
 
-        return date
 
-
-    def convert_values(self, value, value_type):
+    def convert_values(self, value, value_type:str) -> object:
 
         if value_type == 'float':
-            return self.convert_to_float(value)
+            return _to_float(value)
         elif value_type == 'string':
             return str(value)
         else:
@@ -155,56 +241,55 @@ class Measurements:
             return value
 
 
-    def store_data(self, raw_data:dict):
+    def store_data(self, raw_data:dict) -> None:
         '''
         Reads in data passed scraped from html based on the full_id_list and 
         properly stores it into each Measurement object
         '''
-        # Iterating through each Measurement object in list
+        stale = set()  # Measurements whose timestamp was not updated
+        # Local names for lookups repeated on every scraped id
+        field_lookup = self._field_index.get
+        convert_values = self.convert_values
+
+        # Re-initializing the data to an empty dict and checking each
+        # Measurement object's timestamp against the scraped data
         for measurement in self.measurement_list:
-            # Re-initializing the data to an empty dict
             measurement.data = {}
-            
-            # Iterating through each id as a key:value pair from scraped data
-            for key, value in raw_data.items():
-                # Checks if the current measurement object's timestamp matches
-                # scraped data's id
-                if measurement.timestamp_id == key:
-                    # Converts the scraped time string into datetime object
-                    time = self.convert_to_date(value)
-                    # Check if updated time scraped is newer than previous
-                    if (time == measurement.time) or (time is None):
-                        # Do not update data. Results in a blank dict which
-                        # does not update InfluxDB with the write_metric()
-                        # function
-                        logger.info(f'Time of {time} was eiter not found or not updated from previous request.')
-                        break
-                    else:
-                        # New time found, updating time in Measurement object
-                        measurement.time = time
-                # Measurement's timestamp id not found, checking scraped
-                # data's id to the keys in Measurement object
-                # NOTE: Issues may arise if there are non-unique ids in html
-                #       across multiple timestamps
-                else:
-                    # Pull all ids (k) and their data type (v) from
-                    # the Measurement object 
-                    for k, v in measurement.dict_template.items():
-                        # Check if Measurement object's id matches scraped
-                        # data's id
-                        if k == key:
-                            try:
-                                # Convert scraped data value to type based on
-                                # template
-                                corrected_value = self.convert_values(value, v)
-                            except ValueError:
-                                logger.warning(f'{value} cannot be converted to {v}. Ignoring result')
-                                break
-                            # Update the Measurement object's data dict
-                            measurement.data.update({k:corrected_value})
-
-
-    def get_data(self, index:int):
+            ts_id = measurement.timestamp_id
+            if ts_id not in raw_data:
+                continue
+            # Converts the scraped time string into datetime object
+            time = _to_date(raw_data[ts_id])
+            # Check if updated time scraped is newer than previous
+            if (time == measurement.time) or (time is None):
+                # Do not update data. Results in a blank dict which
+                # does not update InfluxDB with the write_metric()
+                # function
+                logger.info('Time of %s was eiter not found or not updated from previous request.', time)
+                stale.add(measurement)
+            else:
+                # New time found, updating time in Measurement object
+                measurement.time = time
+
+        # Iterating through each id as a key:value pair from scraped data
+        # NOTE: Non-unique ids in html across multiple timestamps are stored
+        #       in every Measurement object that lists them
+        for key, value in raw_data.items():
+            # Pull every Measurement object and data type (v) for this id
+            for measurement, v in field_lookup(key, ()):
+                if measurement in stale:
+                    continue
+                try:
+                    # Convert scraped data value to type based on template
+                    corrected_value = convert_values(value, v)
+                except ValueError:
+                    logger.warning('%s cannot be converted to %s. Ignoring result', value, v)
+                    continue
+                # Update the Measurement object's data dict
+                measurement.data[key] = corrected_value
+
+
+    def get_data(self, index:int) -> tuple:
         time = self.measurement_list[index].time
         data = self.measurement_list[index].data
         return data, time
@@ -212,26 +297,18 @@ class Measurements:
 
 class DataPoint:
 
+    __slots__ = ('name', 'data_type', 'value', 'time', 'source_id', 'tags',
+                 'time_id')
+
     def __init__(self, name:str, value:dict):
-        self.name = name
+        self.name = _intern(name)
         self.data_type = value['data_type']
-        self.value = None
-        self.time = None
-
-        try:
-            self.source_id = value['source_id']
-        except KeyError:
-            self.source_id = name
+        self.value: object = None
+        self.time: Optional[datetime] = None
 
-        try:
-            self.tags = value['tags']
-        except KeyError:
-            self.tags = None
-
-        try:
-            self.time_id = value['source_time']
-        except KeyError:
-            self.time_id = None
+        self.source_id = _intern(value.get('source_id', self.name))
+        self.tags = value.get('tags')
+        self.time_id = _intern(value.get('source_time'))
         
 
 class DataList:
@@ -241,41 +318,45 @@ class DataList:
         self.data_list = []  # List of Measurement objects
         self.id_list = []  # List of ids from all DataPoints
         self.time_id_list = [] # List of timestamp ids
-        self.timestamps = {}
+        self.timestamps: dict = {}
+        # Lookup of source id -> [DataPoint, ...] for matching scraped data.
+        # Several DataPoints may share a source id and all of them are updated
+        self._by_source: dict = {}
 
         # Initializing information for holding data
         with open(measurement_filepath, "r") as file:
-            data_format = yaml.safe_load(file)
+            data_format = yaml.load(file, Loader=_SafeLoader)
 
         for key, value in data_format.items():
             if key == 'timestamps':
-                for element in value:
-                    self.timestamps.update({element: None})
+                for element in map(_intern, value):
+                    self.timestamps[element] = None
                     self.time_id_list.append(element)
             else:  
                 point = DataPoint(key, value)
                 self.data_list.append(point)
                 self.id_list.append(point.source_id)
+                self._by_source.setdefault(point.source_id, []).append(point)
 
         self.length = len(self.data_list)
 
         # Grabbing time and additional tags used from the shot
         with open(shot_filepath, 'r') as file:
-            shot = yaml.safe_load(file)
+            shot = yaml.load(file, Loader=_SafeLoader)
         try:
             self.shot_tags = shot['tags']
         except KeyError:
             self.shot_tags = None
-        date_fmt = '%Y-%m-%dT%H:%M:%SZ'
-        self.shot_start_time = datetime.strptime(shot['time']['start'], date_fmt)
-        self.shot_stop_time = datetime.strptime(shot['time']['stop'], date_fmt)
+        date_fmt = _SHOT_DATE_FMT
+        self.shot_start_time = _to_shot_date(shot['time']['start'])
+        self.shot_stop_time = _to_shot_date(shot['time']['stop'])
         
         # Store the start and stop times as strings converted to UTC for querying
         self.shot_start_time_query = (self.shot_start_time.astimezone(timezone.utc)).strftime(date_fmt)
         self.shot_stop_time_query = (self.shot_stop_time.astimezone(timezone.utc)).strftime(date_fmt)
 
     
-    def get_all_tag_id_as_list(self):
+    def get_all_tag_id_as_list(self) -> list:
 
         all_tags = self.shot_tags
         for datapoint in self.data_list:
@@ -285,28 +366,20 @@ class DataList:
         return list(all_tags.keys())
 
 
-    def convert_to_float(self, string):
+    def convert_to_float(self, string:str) -> float:
         
-        # Use regular expression to remove non-numeric characters
-        numeric_string = re.sub(r"[^0-9.]+", "", string)
-        result_float = float(numeric_string)
-
-        return result_float
+        return _to_float(string)
 
 
-    def convert_to_date(self, value):
+    def convert_to_date(self, value:str) -> datetime:
         
-        date_fmt = "%Y-%m-%d %H:%M:%S"
-        # Assuming value is a string representation of a datetime
-        date = datetime.strptime(value, date_fmt)
-
-        return date
+        return _to_date(value)
 
 
-    def convert_values(self, value, value_type):
+    def convert_values(self, value, value_type:str) -> object:
 
         if value_type == 'float':
-            return self.convert_to_float(value)
+            return _to_float(value)
         elif value_type == 'string':
             return str(value)
         else:
@@ -314,42 +387,44 @@ class DataList:
             return value
 
 
-    def store_data(self, scraped_data:dict, scraped_time:dict):
+    def store_data(self, scraped_data:dict, scraped_time:dict) -> None:
         '''
         Reads in data passed scraped from html based on the full_id_list and 
         properly stores it into each Measurement object
         '''
-        # Initialize update flags to false
-        update_flag = {}
-        for time_id, timestamp in self.timestamps.items():
-            update_flag.update({time_id:False})
-
-        # Update timestamps if new and set update flag to true
+        # Timestamp ids that were updated by this scrape
+        updated_ids = set()
+        # Local names for lookups repeated on every scraped id
+        timestamps = self.timestamps
+        source_lookup = self._by_source.get
+        convert_values = self.convert_values
+
+        # Update timestamps if new and flag their ids as updated
         for time_id, timestamp in scraped_time.items():
-            if (timestamp != self.timestamps[time_id]) and (timestamp is not None):
-                update_flag.update({time_id: True})
-                self.timestamps.update({time_id:timestamp})       
+            if (timestamp != timestamps[time_id]) and (timestamp is not None):
+                updated_ids.add(time_id)
+                timestamps[time_id] = timestamp
+
+        # Single time shared by every DataPoint without a timestamp id
+        now = datetime.now()
         
-        # Loop for updating all the DataPoints in the list
+        # Reset all the DataPoints in the list, using current time for the
+        # ones where timestamp is not specified
         for datapoint in self.data_list:
             datapoint.value = None 
-            # Update values using current time if timestamp not specified
             if datapoint.time_id is None:
-                datapoint.time = datetime.now()
-                for value_id, value_data in scraped_data.items():
-                    if value_id == datapoint.source_id:
-                        try:
-                            datapoint.value = self.convert_values(value_data, datapoint.data_type)
-                        except ValueError:
-                            logger.warning(f'{value_data} cannot be converted to {datapoint.data_type}. Ignoring result')
-                        break
-
-            # Update values if update flag is set to True for DataPoint's given timestamp
-            elif (update_flag[datapoint.time_id]):
-                for value_id, value_data in scraped_data.items():
-                    if value_id == datapoint.source_id:
-                        try:
-                            datapoint.value = self.convert_values(value_data, datapoint.data_type)
-                        except ValueError:
-                            logger.warning(f'{value_data} cannot be converted to {datapoint.data_type}. Ignoring result')
-                        break
\ No newline at end of file
+                datapoint.time = now
+
+        # Loop for updating the DataPoints matching each scraped id
+        for value_id, value_data in scraped_data.items():
+            for datapoint in source_lookup(value_id, ()):
+                # Only update values if timestamp not specified or the
+                # DataPoint's given timestamp was updated
+                time_id = datapoint.time_id
+                if (time_id is not None) and (time_id not in updated_ids):
+                    continue
+                data_type = datapoint.data_type
+                try:
+                    datapoint.value = convert_values(value_data, data_type)
+                except ValueError:
+                    logger.warning('%s cannot be converted to %s. Ignoring result', value_data, data_type)
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from data_processing import Measurements, Shots
+
+
+MEASUREMENTS_YAML = """
+ts1:
+  a: float
+  shared: float
+ts2:
+  b: string
+  shared: float
+"""
+
+
+SHOTS_YAML = """
+shots:
+  - tags: {shot: 2}
+    time: {start: '2023-01- 2T03:04:05Z', stop: '2023-01- 2T04:04:05Z'}
+  - tags: {shot: 1}
+    time: {start: '2023-01-01T00:00:00Z', stop: '2023-01-01T01:00:00Z'}
+"""
+
+
+def test_shots_sorted_by_start_time(tmp_path):
+    filepath = tmp_path / 'shots.yaml'
+    filepath.write_text(SHOTS_YAML)
+    shots = Shots(str(filepath))
+
+    assert [shot.tags['shot'] for shot in shots.shot_list] == [1, 2]
+    assert shots.shot_list[1].start_time == datetime(2023, 1, 2, 3, 4, 5)
+
+
+def make_measurements(tmp_path):
+    filepath = tmp_path / 'measurements.yaml'
+    filepath.write_text(MEASUREMENTS_YAML)
+    return Measurements(str(filepath))
+
+
+def test_store_data_shared_id(tmp_path):
+    measurements = make_measurements(tmp_path)
+    measurements.store_data({
+        'ts1': '2024-01-01 00:00:00',
+        'a': '1.5 V',
+        'shared': '2',
+        'ts2': '2024-01-01 00:00:01',
+        'b': 3,
+    })
+
+    assert measurements.get_data(0) == ({'a': 1.5, 'shared': 2.0},
+                                        datetime(2024, 1, 1, 0, 0, 0))
+    assert measurements.get_data(1) == ({'b': '3', 'shared': 2.0},
+                                        datetime(2024, 1, 1, 0, 0, 1))
+
+
+def test_store_data_stale_timestamp(tmp_path):
+    measurements = make_measurements(tmp_path)
+    measurements.store_data({'ts1': '2024-01-01 00:00:00', 'a': '1',
+                             'ts2': '2024-01-01 00:00:01', 'b': 'x'})
+
+    # Data ids placed before their timestamp id are still dropped when the
+    # timestamp has not been updated
+    measurements.store_data({'a': '2', 'shared': '3',
+                             'ts1': '2024-01-01 00:00:00',
+                             'ts2': '2024-01-01 00:00:02', 'b': 'y'})
+
+    assert measurements.get_data(0) == ({}, datetime(2024, 1, 1, 0, 0, 0))
+    assert measurements.get_data(1) == ({'b': 'y', 'shared': 3.0},
+                                        datetime(2024, 1, 1, 0, 0, 2))